@@ -1,6 +1,16 @@
+import time
+
+# Taken first, so that the start-up timing report covers all imports of this module.
+_MODULE_IMPORT_START = time.perf_counter()
+
+import logging
 import math
+import os
+import shutil
+import tempfile
 import traceback
-from typing import Optional, List
+import uuid
+from typing import TYPE_CHECKING, Callable, Dict, Optional, List
 
 import qt
 import slicer
@@ -9,19 +19,36 @@ from MRMLCorePython import (
     vtkMRMLScene,
     vtkMRMLSliceNode,
 )
-from MRMLLogicPython import vtkMRMLSliceLogic
 from slicer.ScriptedLoadableModule import (
     ScriptedLoadableModule,
     ScriptedLoadableModuleLogic,
     ScriptedLoadableModuleTest,
     ScriptedLoadableModuleWidget,
 )
-from vtkSlicerSequencesModuleMRMLPython import vtkMRMLSequenceBrowserNode
 from vtkmodules.vtkCommonKitPython import vtkCommand
+from vtkmodules.vtkCommonMathPython import vtkMatrix4x4
+
+# This module is imported on every Slicer start, so everything that is only needed once
+# a timeline is loaded is imported where it is used.
+if TYPE_CHECKING:
+    import numpy as np
+    from MRMLLogicPython import vtkMRMLSliceLogic
+    from vtkSlicerSequencesModuleMRMLPython import vtkMRMLSequenceBrowserNode
+
+    from DeepArcTimelineLib import render_worker
+    from DeepArcTimelineLib.intensity_index import IntensityStatisticsIndex
+    from DeepArcTimelineLib.slice_geometry import TimelineGeometry
+
+# Durations (and the start-up completion time) in seconds, see startup_timing_report()
+_startup_timings: Dict[str, float] = {}
+
+# Dynamic property of slicer.app that is set once startupCompleted() is connected
+STARTUP_OBSERVED_PROPERTY = "DeepArcTimelineStartupObserved"
 
 
 class DeepArcTimeline(ScriptedLoadableModule):
     def __init__(self, parent):
+        start = time.perf_counter()
         ScriptedLoadableModule.__init__(self, parent)
 
         self.parent.title = "DeepArc Timeline"
@@ -36,6 +63,12 @@ class DeepArcTimeline(ScriptedLoadableModule):
         self.parent.helpText = "This is the DeepArc Timeline extension for 3D Slicer."
         self.parent.acknowledgementText = ""
 
+        # Module reloads re-run this file, so remember the connection on the application.
+        if not slicer.app.property(STARTUP_OBSERVED_PROPERTY):
+            slicer.app.setProperty(STARTUP_OBSERVED_PROPERTY, True)
+            slicer.app.connect("startupCompleted()", on_startup_completed)
+        _startup_timings["module_init"] = time.perf_counter() - start
+
     def setup(self):
         """
         This method is called when this extension is loaded (e.g. when Slicer is started
@@ -49,6 +82,7 @@ class DeepArcTimelineWidget(
 ):
     INPUT_SLICE = "InputSlice"
     INPUT_SEQUENCE_BROWSER = "InputSequenceBrowser"
+    RENDER_WORKERS = "RenderWorkers"
 
     def __init__(self, parent=None):
         """
@@ -57,6 +91,8 @@ class DeepArcTimelineWidget(
         """
         ScriptedLoadableModuleWidget.__init__(self, parent)
 
+        _startup_timings.setdefault("first_open_start", time.perf_counter())
+
         # This is needed for parameter node observation.
         slicer.util.VTKObservationMixin.__init__(self)
 
@@ -78,6 +114,7 @@ class DeepArcTimelineWidget(
         Called when the user opens the module the first time and the widget is
         initialized.
         """
+        start = time.perf_counter()
         ScriptedLoadableModuleWidget.setup(self)
 
         # Load widget from .ui file (created by Qt Designer). Additional widgets can be
@@ -98,12 +135,6 @@ class DeepArcTimelineWidget(
         # MRML widget's "setMRMLScene(vtkMRMLScene*)" slot.
         ui_widget.setMRMLScene(slicer.mrmlScene)
 
-        # Load additional widgets
-        self.timeline_widget = TimelineWidget()
-        slicer.util.mainWindow().addDockWidget(
-            qt.Qt.BottomDockWidgetArea, self.timeline_widget
-        )
-
         # Create the logic class. Logic implements all computations that should be
         # possible to run in batch mode, without a graphical user interface.
         self.logic = DeepArcTimelineLogic()
@@ -128,24 +159,33 @@ class DeepArcTimelineWidget(
                 "currentNodeChanged(vtkMRMLNode*)",
                 self.update_parameter_node_from_gui,
             )
+        self.ui.render_workers_spin_box.connect(
+            "valueChanged(int)", self.update_parameter_node_from_gui
+        )
 
         # Connect signals
-        self.timeline_widget.progressUpdate.connect(self.ui.progress_bar.setValue)
         self.ui.btn_load.connect("clicked()", self.load_timeline)
         self.ui.btn_toggle_timeline.connect(
             "clicked()",
             self.btn_toggle_timeline_clicked,
         )
 
+        # The timeline dock is only created when a timeline is loaded.
+        self.ui.btn_toggle_timeline.enabled = False
+
         # Make sure the parameter node is initialized (needed for module reload).
         self.initialize_parameter_node()
 
+        _startup_timings.setdefault("widget_setup", time.perf_counter() - start)
+
     def cleanup(self):
         """
         Called when the application closes and the module widget is destroyed.
         """
         self.removeObservers()
-        slicer.util.mainWindow().removeDockWidget(self.timeline_widget)
+        self.remove_timeline_widget()
+        if self.logic is not None:
+            self.logic.stop_render_workers()
 
     def load_timeline(self):
         try:
@@ -162,14 +202,48 @@ class DeepArcTimelineWidget(
             if slice_widget is None:
                 return
 
-            sequence_browser_node: vtkMRMLSequenceBrowserNode = (
+            sequence_browser_node: "vtkMRMLSequenceBrowserNode" = (
                 self.parameter_node.GetNodeReference(self.INPUT_SEQUENCE_BROWSER)
             )
 
+            self.logic.set_local_render_worker_count(
+                self.ui.render_workers_spin_box.value
+            )
+
+            self.create_timeline_widget()
             self.timeline_widget.initialize(slice_widget, sequence_browser_node)
+        except Exception as e:
+            slicer.util.errorDisplay("Failed to load the timeline: " + str(e))
+            traceback.print_exc()
         finally:
             qt.QApplication.restoreOverrideCursor()
 
+    def create_timeline_widget(self):
+        """
+        Create the timeline dock when a timeline is loaded and there is none yet.
+        """
+        if self.timeline_widget is not None:
+            return
+        self.timeline_widget = TimelineWidget()
+        self.timeline_widget.logic = self.logic
+        self.timeline_widget.progressUpdate.connect(self.ui.progress_bar.setValue)
+        slicer.util.mainWindow().addDockWidget(
+            qt.Qt.BottomDockWidgetArea, self.timeline_widget
+        )
+        self.ui.btn_toggle_timeline.enabled = True
+
+    def remove_timeline_widget(self):
+        """
+        Remove and delete the timeline dock. The next load creates a new one.
+        """
+        if self.timeline_widget is None:
+            return
+        self.timeline_widget.remove_observers()
+        slicer.util.mainWindow().removeDockWidget(self.timeline_widget)
+        self.timeline_widget.deleteLater()
+        self.timeline_widget = None
+        self.ui.btn_toggle_timeline.enabled = False
+
     def btn_toggle_timeline_clicked(self):
         if self.timeline_widget is not None:
             self.timeline_widget.setVisible(not self.timeline_widget.isVisible())
@@ -181,6 +255,17 @@ class DeepArcTimelineWidget(
         # Make sure the parameter node exists and is observed.
         self.initialize_parameter_node()
 
+        if "first_open" not in _startup_timings:
+            _startup_timings["first_open"] = (
+                time.perf_counter() - _startup_timings["first_open_start"]
+            )
+            # The report looks up the process start time, which is only worth it for
+            # developers.
+            if slicer.util.settingsValue(
+                "Developer/DeveloperMode", False, converter=slicer.util.toBool
+            ):
+                logging.info(startup_timing_report())
+
     def exit(self):
         """
         Called each time the user opens a different module.
@@ -199,7 +284,7 @@ class DeepArcTimelineWidget(
         """
         # The parameter node will be reset, do not use it anymore.
         self.set_parameter_node(None)
-        slicer.util.mainWindow().removeDockWidget(self.timeline_widget)
+        self.remove_timeline_widget()
 
     def on_scene_end_close(self, caller: vtkMRMLScene, event: str):
         """
@@ -265,6 +350,9 @@ class DeepArcTimelineWidget(
 
         for ref_name, widget in self.mrml_node_widgets.items():
             widget.setCurrentNode(self.parameter_node.GetNodeReference(ref_name))
+        self.ui.render_workers_spin_box.value = int(
+            self.parameter_node.GetParameter(self.RENDER_WORKERS) or 0
+        )
 
         # All the GUI updates are done
         self.updating_gui_from_parameter_node = False
@@ -283,6 +371,9 @@ class DeepArcTimelineWidget(
 
         for ref_name, widget in self.mrml_node_widgets.items():
             self.parameter_node.SetNodeReferenceID(ref_name, widget.currentNodeID)
+        self.parameter_node.SetParameter(
+            self.RENDER_WORKERS, str(self.ui.render_workers_spin_box.value)
+        )
 
         self.parameter_node.EndModify(was_modified)
 
@@ -311,18 +402,45 @@ class TimelineWidget(qt.QDockWidget):
         container.setLayout(qt.QGridLayout())
         container.layout().setAlignment(qt.Qt.AlignTop | qt.Qt.AlignLeft)
 
-        scroll_area = qt.QScrollArea()
-        scroll_area.setWidgetResizable(True)
-        scroll_area.setWidget(container)
-        scroll_area.installEventFilter(self)
+        self._scroll_area = qt.QScrollArea()
+        self._scroll_area.setWidgetResizable(True)
+        self._scroll_area.setWidget(container)
+        self._scroll_area.installEventFilter(self)
+
+        self.change_strip = HeatStripWidget()
+        self.change_strip.setToolTip(
+            "Intensity change to the previous sequence item in the selected row"
+        )
+        self.change_strip.clicked.connect(self.select_column)
+
+        btn_max_change = qt.QPushButton("Jump to Max Change")
+        btn_max_change.connect("clicked()", self.jump_to_max_change)
+
+        self.navigation = qt.QWidget()
+        self.navigation.setLayout(qt.QHBoxLayout())
+        self.navigation.layout().setContentsMargins(0, 0, 0, 0)
+        self.navigation.layout().addWidget(self.change_strip, 1)
+        self.navigation.layout().addWidget(btn_max_change)
+        self.navigation.setVisible(False)
+
+        dock_contents = qt.QWidget()
+        dock_contents.setLayout(qt.QVBoxLayout())
+        dock_contents.layout().addWidget(self.navigation)
+        dock_contents.layout().addWidget(self._scroll_area)
 
         self.setAllowedAreas(qt.Qt.TopDockWidgetArea | qt.Qt.BottomDockWidgetArea)
-        self.setWidget(scroll_area)
+        self.setWidget(dock_contents)
 
         # Attributes
 
         self.slice_widget: Optional[slicer.qMRMLSliceWidget] = None
-        self.sequence_browser_node: Optional[vtkMRMLSequenceBrowserNode] = None
+        self.sequence_browser_node: Optional["vtkMRMLSequenceBrowserNode"] = None
+
+        # Renders the slice images in worker processes if any are running
+        self.logic: Optional[DeepArcTimelineLogic] = None
+
+        # (observed object, observer tag) pairs of the slice and sequence browser nodes
+        self.observer_tags = []
 
         # For enabling panning inside the scroll area
         self.mouse_pos = None
@@ -337,40 +455,49 @@ class TimelineWidget(qt.QDockWidget):
         self.row_selected = 0
         self.col_selected = 0
 
+        # Maps the rows of the timeline to slice offsets
+        self.geometry: Optional["TimelineGeometry"] = None
+
+        # For navigating the timeline by intensity statistics
+        self.statistics: Optional["IntensityStatisticsIndex"] = None
+
     def initialize(
         self,
         slice_widget: slicer.qMRMLSliceWidget,
-        sequence_browser_node: Optional[vtkMRMLSequenceBrowserNode] = None,
+        sequence_browser_node: Optional["vtkMRMLSequenceBrowserNode"] = None,
     ):
         self.progress(0)
 
         # Remove observers from previously stored objects
-        if self.slice_widget is not None:
-            self.slice_widget.mrmlSliceNode().RemoveObserver(vtkCommand.ModifiedEvent)
-        if self.sequence_browser_node is not None:
-            self.sequence_browser_node.RemoveObserver(vtkCommand.ModifiedEvent)
+        self.remove_observers()
 
         # Store objects
         self.slice_widget = slice_widget
         self.sequence_browser_node = sequence_browser_node
 
         # Add observers to newly stored objects
-        self.slice_widget.mrmlSliceNode().AddObserver(
-            vtkCommand.ModifiedEvent, self.slice_node_modified
-        )
+        slice_node = self.slice_widget.mrmlSliceNode()
+        tag = slice_node.AddObserver(vtkCommand.ModifiedEvent, self.slice_node_modified)
+        self.observer_tags.append((slice_node, tag))
         if self.sequence_browser_node is not None:
-            self.sequence_browser_node.AddObserver(
+            tag = self.sequence_browser_node.AddObserver(
                 vtkCommand.ModifiedEvent, self.sequence_browser_node_modified
             )
+            self.observer_tags.append((self.sequence_browser_node, tag))
 
         self.reset()
         self.progress(100)
 
+    def remove_observers(self):
+        for node, tag in self.observer_tags:
+            node.RemoveObserver(tag)
+        self.observer_tags = []
+
     # Properties
 
     @property
     def grid(self) -> qt.QGridLayout:
-        return self.widget().widget().layout()
+        return self.scroll_area.widget().layout()
 
     @property
     def rows(self):
@@ -382,7 +509,7 @@ class TimelineWidget(qt.QDockWidget):
 
     @property
     def scroll_area(self) -> qt.QScrollArea:
-        return self.widget()
+        return self._scroll_area
 
     @property
     def vertical_scroll_bar(self) -> qt.QScrollBar:
@@ -393,16 +520,10 @@ class TimelineWidget(qt.QDockWidget):
         return self.scroll_area.horizontalScrollBar()
 
     @property
-    def slice_logic(self) -> vtkMRMLSliceLogic:
-        slice_logic: vtkMRMLSliceLogic = self.slice_widget.sliceLogic()
+    def slice_logic(self) -> "vtkMRMLSliceLogic":
+        slice_logic: "vtkMRMLSliceLogic" = self.slice_widget.sliceLogic()
         return slice_logic
 
-    @property
-    def slice_bounds(self) -> List[float]:
-        b = [0.0] * 6
-        self.slice_logic.GetSliceBounds(b)
-        return b
-
     # Event handlers
 
     def eventFilter(self, source: qt.QObject, event: qt.QEvent) -> bool:
@@ -440,7 +561,7 @@ class TimelineWidget(qt.QDockWidget):
 
     def sequence_browser_node_modified(
         self,
-        observer: vtkMRMLSequenceBrowserNode,
+        observer: "vtkMRMLSequenceBrowserNode",
         event_id: str,
     ):
         selected_item_number = observer.GetSelectedItemNumber()
@@ -462,31 +583,71 @@ class TimelineWidget(qt.QDockWidget):
 
     def reset(self):
         self.begin_render_slice_images()
+        try:
+            # Calculate the total number of rows and cols
+            self.geometry = create_timeline_geometry(self.slice_logic)
+            rows = self.geometry.rows
+            cols = 1
+            if self.sequence_browser_node is not None:
+                cols = self.sequence_browser_node.GetNumberOfItems()
 
-        # Calculate the total number of rows and cols
-        bounds = self.slice_bounds
-        volume_slice_spacing = self.slice_logic.GetLowestVolumeSliceSpacing()
-        rows = int((bounds[5] - bounds[4]) / volume_slice_spacing[2])
-        cols = 1
-        if self.sequence_browser_node is not None:
-            cols = self.sequence_browser_node.GetNumberOfItems()
-
-        # Create placeholder widgets for the images
-        for row in range(rows):
-            self.progress(math.ceil(100 * row / rows))
-            for col in range(cols):
-                w = TimelineEntryWidget(
-                    self.slice_widget,
+            jobs = []
+            if self.logic is not None and self.logic.render_workers:
+                jobs = self.logic.create_render_jobs(
                     self.slice_logic,
                     self.sequence_browser_node,
-                    row,
-                    col,
+                    self.geometry,
+                    cols,
+                    TimelineEntryWidget.DEFAULT_IMAGE_SIZE,
                 )
-                w.selected.connect(self.update_slice_widget)
-                w.load()
-                self.grid.addWidget(w, row, col)
 
-        self.end_render_slice_images()
+            # Create placeholder widgets for the images
+            for row in range(rows):
+                if not jobs:
+                    self.progress(math.ceil(100 * row / rows))
+                for col in range(cols):
+                    w = TimelineEntryWidget(
+                        self.slice_widget,
+                        self.slice_logic,
+                        self.geometry,
+                        self.sequence_browser_node,
+                        row,
+                        col,
+                    )
+                    w.selected.connect(self.update_slice_widget)
+                    if not jobs:
+                        w.load()
+                    self.grid.addWidget(w, row, col)
+
+            if jobs:
+                self.logic.render_tiles(jobs, self.set_encoded_image, self.progress)
+
+            self.statistics = None
+            if self.logic is not None:
+                self.statistics = self.logic.create_statistics_index(
+                    self.slice_logic, self.sequence_browser_node, self.geometry, cols
+                )
+            self.navigation.setVisible(self.statistics is not None)
+        except Exception:
+            # Do not leave a half-loaded timeline behind.
+            clear_layout(self.grid)
+            self.geometry = None
+            self.statistics = None
+            self.navigation.setVisible(False)
+            raise
+        finally:
+            # The volumes written for the render workers are only needed while
+            # rendering.
+            if self.logic is not None:
+                self.logic.clear_render_cache()
+            # Resumes rendering and restores the slice and sequence browser state.
+            self.end_render_slice_images()
+
+    def set_encoded_image(self, row: int, col: int, data: bytes):
+        item = self.grid.itemAtPosition(row, col)
+        if item is not None:
+            w: TimelineEntryWidget = item.widget()
+            w.set_encoded_image(data)
 
     def save_state(self):
         if self.sequence_browser_node is not None:
@@ -520,6 +681,8 @@ class TimelineWidget(qt.QDockWidget):
         slice_offset: Optional[float] = None,
         selected_item_number: Optional[int] = None,
     ):
+        if self.geometry is None:
+            return
         if slice_offset is None:
             slice_offset = self.slice_logic.GetSliceOffset()
         if selected_item_number is None:
@@ -530,11 +693,10 @@ class TimelineWidget(qt.QDockWidget):
                 )
 
         self.unselect_current_timeline_entry()
-        self.row_selected = TimelineWidget.row_for_slice_offset(
-            self.slice_logic, slice_offset
-        )
+        self.row_selected = self.geometry.row_for_slice_offset(slice_offset)
         self.col_selected = selected_item_number
         self.select_current_timeline_entry()
+        self.update_change_strip()
 
     def update_slice_widget(self, row: int, col: int):
         if row == self.row_selected and col == self.col_selected:
@@ -543,6 +705,31 @@ class TimelineWidget(qt.QDockWidget):
         self.row_selected = row
         self.col_selected = col
         self.sync_slice_widget()
+        self.update_change_strip()
+
+    def select_column(self, col: int):
+        self.jump_to_timeline_entry(self.row_selected, col)
+
+    def jump_to_max_change(self):
+        if self.statistics is not None:
+            self.jump_to_timeline_entry(*self.statistics.max_change())
+
+    def jump_to_timeline_entry(self, row: int, col: int):
+        item = self.grid.itemAtPosition(row, col)
+        if item is None:
+            return
+        w: TimelineEntryWidget = item.widget()
+        w.is_selected = True
+        self.scroll_area.ensureWidgetVisible(w)
+        self.update_slice_widget(row, col)
+
+    def update_change_strip(self):
+        if self.statistics is None or not 0 <= self.row_selected < self.statistics.rows:
+            self.change_strip.set_values([], -1)
+            return
+        self.change_strip.set_values(
+            self.statistics.normalized_change(self.row_selected), self.col_selected
+        )
 
     def unselect_current_timeline_entry(self):
         item = self.grid.itemAtPosition(self.row_selected, self.col_selected)
@@ -557,9 +744,9 @@ class TimelineWidget(qt.QDockWidget):
             w.is_selected = True
 
     def sync_slice_widget(self):
-        slice_offset = TimelineWidget.slice_offset_for_row(
-            self.slice_logic, self.row_selected
-        )
+        if self.geometry is None:
+            return
+        slice_offset = self.geometry.slice_offset_for_row(self.row_selected)
         selected_item_number = self.col_selected
 
         self.slice_logic.SetSliceOffset(slice_offset)
@@ -567,22 +754,6 @@ class TimelineWidget(qt.QDockWidget):
             self.sequence_browser_node.SetSelectedItemNumber(selected_item_number)
         self.slice_widget.sliceView().forceRender()
 
-    @staticmethod
-    def slice_offset_for_row(slice_logic: vtkMRMLSliceLogic, row: int):
-        bounds = [0.0] * 6
-        slice_logic.GetSliceBounds(bounds)
-        min_slice_y = bounds[4]
-        slice_thickness = slice_logic.GetLowestVolumeSliceSpacing()[2]
-        return min_slice_y + slice_thickness * row
-
-    @staticmethod
-    def row_for_slice_offset(slice_logic: vtkMRMLSliceLogic, slice_offset: float):
-        bounds = [0.0] * 6
-        slice_logic.GetSliceBounds(bounds)
-        min_slice_y = bounds[4]
-        slice_thickness = slice_logic.GetLowestVolumeSliceSpacing()[2]
-        return int((slice_offset - min_slice_y) / slice_thickness)
-
 
 class TimelineEntryWidget(qt.QLabel):
     DEFAULT_IMAGE_SIZE = 256
@@ -592,8 +763,9 @@ class TimelineEntryWidget(qt.QLabel):
     def __init__(
         self,
         slice_widget: slicer.qMRMLSliceWidget,
-        slice_logic: vtkMRMLSliceLogic,
-        sequence_browser_node: vtkMRMLSequenceBrowserNode,
+        slice_logic: "vtkMRMLSliceLogic",
+        geometry: "TimelineGeometry",
+        sequence_browser_node: "vtkMRMLSequenceBrowserNode",
         row: int,
         col: int,
         parent: Optional[qt.QWidget] = None,
@@ -602,6 +774,7 @@ class TimelineEntryWidget(qt.QLabel):
 
         self.slice_widget = slice_widget
         self.slice_logic = slice_logic
+        self.geometry = geometry
         self.sequence_browser_node = sequence_browser_node
         self.row = row
         self.col = col
@@ -638,7 +811,7 @@ class TimelineEntryWidget(qt.QLabel):
         if self._image is not None:
             return
 
-        slice_offset = TimelineWidget.slice_offset_for_row(self.slice_logic, self.row)
+        slice_offset = self.geometry.slice_offset_for_row(self.row)
         selected_item_number = self.col
         self.slice_logic.SetSliceOffset(slice_offset)
         if (
@@ -658,6 +831,14 @@ class TimelineEntryWidget(qt.QLabel):
 
         self.setPixmap(qt.QPixmap.fromImage(self._image))
 
+    def set_encoded_image(self, data: bytes):
+        """
+        Show an image that was rendered by a render worker.
+        """
+        self._image = qt.QImage()
+        self._image.loadFromData(qt.QByteArray(data))
+        self.setPixmap(qt.QPixmap.fromImage(self._image))
+
     def _update_border_color(self):
         if self.is_selected:
             self._set_border_color("green")
@@ -668,6 +849,57 @@ class TimelineEntryWidget(qt.QLabel):
         self.setStyleSheet("border: 1px solid %s;" % color)
 
 
+class HeatStripWidget(qt.QWidget):
+    """
+    Draws one cell per timeline column, colored from blue (0) to red (1).
+    """
+
+    DEFAULT_HEIGHT = 16
+
+    clicked = qt.Signal(int)
+
+    def __init__(self, parent: Optional[qt.QWidget] = None):
+        super().__init__(parent)
+
+        self.setMinimumHeight(self.DEFAULT_HEIGHT)
+        self.setSizePolicy(qt.QSizePolicy.Expanding, qt.QSizePolicy.Fixed)
+
+        self._values: List[float] = []
+        self._marked_col = -1
+
+    def set_values(self, values: List[float], marked_col: int):
+        self._values = values
+        self._marked_col = marked_col
+        self.update()
+
+    def sizeHint(self) -> qt.QSize:
+        return qt.QSize(200, self.DEFAULT_HEIGHT)
+
+    def col_at(self, x: int) -> int:
+        return min(len(self._values) - 1, int(x * len(self._values) / self.width))
+
+    def mousePressEvent(self, event: qt.QMouseEvent):
+        if self._values and event.buttons() & qt.Qt.LeftButton:
+            self.clicked.emit(self.col_at(event.pos().x()))
+
+    def paintEvent(self, event: qt.QPaintEvent):
+        if not self._values:
+            return
+        painter = qt.QPainter(self)
+        cell_width = self.width / len(self._values)
+        for col, value in enumerate(self._values):
+            x = int(col * cell_width)
+            w = max(1, int((col + 1) * cell_width) - x)
+            color = qt.QColor.fromHsv(int(240 * (1.0 - value)), 255, 255)
+            painter.fillRect(x, 0, w, self.height, color)
+        if 0 <= self._marked_col < len(self._values):
+            x = int(self._marked_col * cell_width)
+            w = max(1, int((self._marked_col + 1) * cell_width) - x)
+            painter.setPen(qt.QColor("black"))
+            painter.drawRect(x, 0, w - 1, self.height - 1)
+        painter.end()
+
+
 class DeepArcTimelineLogic(ScriptedLoadableModuleLogic):
     """
     This class should implement all the actual computation done by your module. The
@@ -678,11 +910,221 @@ class DeepArcTimelineLogic(ScriptedLoadableModuleLogic):
     def __init__(self):
         super().__init__()
 
+        self.render_workers: List["render_worker.RenderWorkerClient"] = []
+        self.render_worker_authkey = os.urandom(32)
+
+        # Holds the voxel arrays that are shared with the render workers
+        self.render_cache_dir: Optional[str] = None
+
     def set_default_parameters(self, node: vtkMRMLScriptedModuleNode):
         """
         Initialize the parameter node with default settings.
         """
-        pass
+        if not node.GetParameter(DeepArcTimelineWidget.RENDER_WORKERS):
+            node.SetParameter(DeepArcTimelineWidget.RENDER_WORKERS, "0")
+
+    # Render workers
+
+    def set_local_render_worker_count(self, count: int):
+        """
+        Start or stop local render worker processes until exactly ``count`` of them are
+        running. Render workers on other hosts are not affected.
+        """
+        from DeepArcTimelineLib import render_worker
+
+        # Forget local workers that have crashed or exited.
+        for worker in list(self.render_workers):
+            if worker.process is not None and worker.process.poll() is not None:
+                self.render_workers.remove(worker)
+                worker.close()
+
+        local_workers = [w for w in self.render_workers if w.process is not None]
+        if len(local_workers) < count:
+            # Inside Slicer, sys.executable is the Slicer application itself.
+            python_executable = shutil.which("PythonSlicer")
+            if not python_executable:
+                raise RuntimeError("PythonSlicer executable not found")
+        while len(local_workers) < count:
+            worker = render_worker.RenderWorkerClient.launch_local(
+                python_executable, self.render_worker_authkey
+            )
+            self.render_workers.append(worker)
+            local_workers.append(worker)
+        while len(local_workers) > count:
+            worker = local_workers.pop()
+            self.render_workers.remove(worker)
+            worker.close()
+
+    def connect_render_worker(self, host: str, port: int, authkey: bytes):
+        """
+        Connect to a render worker that was started separately, e.g. on another host.
+        The worker must be able to read the files in ``render_cache_dir``.
+        """
+        from DeepArcTimelineLib import render_worker
+
+        self.render_workers.append(
+            render_worker.RenderWorkerClient.connect((host, port), authkey)
+        )
+
+    def stop_render_workers(self):
+        for worker in self.render_workers:
+            worker.close()
+        self.render_workers = []
+        self.clear_render_cache()
+
+    def clear_render_cache(self):
+        if self.render_cache_dir is not None:
+            shutil.rmtree(self.render_cache_dir, ignore_errors=True)
+            self.render_cache_dir = None
+
+    def create_render_jobs(
+        self,
+        slice_logic: "vtkMRMLSliceLogic",
+        sequence_browser_node: Optional["vtkMRMLSequenceBrowserNode"],
+        geometry: "TimelineGeometry",
+        cols: int,
+        tile_size: int,
+    ) -> List[dict]:
+        """
+        Create one render job per sequence item, sampling the background volume of the
+        slice at every row. Returns an empty list if there is nothing the workers can
+        render, in which case the images have to be rendered in-process. This is also
+        the case if the sequence items do not share one voxel lattice, because all jobs
+        share the index maps of ``geometry``.
+        """
+        import numpy as np
+
+        from DeepArcTimelineLib import render_worker
+
+        volume_node = background_volume_node(slice_logic)
+        if volume_node is None:
+            return []
+        data_nodes = shared_lattice_data_nodes(
+            geometry, volume_node, sequence_browser_node, cols
+        )
+        if data_nodes is None:
+            return []
+
+        self.clear_render_cache()
+        self.render_cache_dir = tempfile.mkdtemp(prefix="DeepArcTimeline-")
+
+        display_node = volume_node.GetDisplayNode()
+        geometry_id = uuid.uuid4().hex
+        xy_to_ijk_rows = geometry.xy_to_ijk_rows()
+
+        jobs = []
+        for col, data_node in enumerate(data_nodes):
+            volume_path = os.path.join(self.render_cache_dir, "item_%d.npy" % col)
+            np.save(volume_path, slicer.util.arrayFromVolume(data_node))
+
+            tiles = [{"row": row, "col": col} for row in range(geometry.rows)]
+            jobs.append(
+                render_worker.make_render_job(
+                    col,
+                    volume_path,
+                    geometry_id,
+                    xy_to_ijk_rows,
+                    geometry.dimensions,
+                    display_node.GetWindow(),
+                    display_node.GetLevel(),
+                    tiles,
+                    tile_size,
+                )
+            )
+        return jobs
+
+    def create_statistics_index(
+        self,
+        slice_logic: "vtkMRMLSliceLogic",
+        sequence_browser_node: Optional["vtkMRMLSequenceBrowserNode"],
+        geometry: "TimelineGeometry",
+        cols: int,
+        sample_size: int = 64,
+    ) -> Optional["IntensityStatisticsIndex"]:
+        """
+        Compute the intensity statistics of every timeline tile from the background
+        volume of the slice, sampled at ``sample_size`` pixels per tile. Returns None if
+        the slice shows no volume or its sequence items do not share one voxel lattice.
+        """
+        from DeepArcTimelineLib.intensity_index import IntensityStatisticsIndex
+
+        volume_node = background_volume_node(slice_logic)
+        if volume_node is None:
+            return None
+        data_nodes = shared_lattice_data_nodes(
+            geometry, volume_node, sequence_browser_node, cols
+        )
+        if data_nodes is None:
+            return None
+
+        index = IntensityStatisticsIndex(geometry.rows, cols)
+        for col, data_node in enumerate(data_nodes):
+            samples = geometry.sample(
+                slicer.util.arrayFromVolume(data_node), sample_size
+            )
+            index.add_column(col, samples)
+        index.finalize()
+        return index
+
+    def render_tiles(
+        self,
+        jobs: List[dict],
+        tile_ready: Callable[[int, int, bytes], None],
+        progress: Optional[Callable[[int], None]] = None,
+    ):
+        """
+        Distribute the jobs over all render workers and call ``tile_ready`` with the
+        row, col and encoded image of every rendered tile.
+
+        If anything fails, all render workers are stopped before the error is raised:
+        the others may still be sending replies that would otherwise be read by the
+        next call.
+        """
+        from multiprocessing.connection import wait
+
+        from DeepArcTimelineLib import render_worker
+
+        if not self.render_workers:
+            raise RuntimeError("No render workers are running")
+
+        pending = list(jobs)
+        total_tiles = max(1, sum(len(job["tiles"]) for job in jobs))
+        rendered_tiles = 0
+        # Connection -> (worker, id of the job it is rendering)
+        busy = {}
+
+        def dispatch(worker: "render_worker.RenderWorkerClient"):
+            if pending:
+                job = pending.pop(0)
+                worker.send_job(job)
+                busy[worker.conn] = (worker, job["job_id"])
+
+        try:
+            for worker in self.render_workers:
+                dispatch(worker)
+
+            while busy:
+                for conn in wait(list(busy)):
+                    worker, job_id = busy[conn]
+                    header, payload = worker.receive()
+                    if header.get("job_id") != job_id:
+                        raise RuntimeError(
+                            "Render worker replied to job %s while rendering job %s"
+                            % (header.get("job_id"), job_id)
+                        )
+                    if header["type"] == render_worker.MESSAGE_TILE:
+                        tile_ready(header["row"], header["col"], payload)
+                        rendered_tiles += 1
+                        if progress is not None:
+                            progress(math.ceil(100 * rendered_tiles / total_tiles))
+                    elif header["type"] == render_worker.MESSAGE_DONE:
+                        del busy[conn]
+                        dispatch(worker)
+                    elif header["type"] == render_worker.MESSAGE_ERROR:
+                        raise RuntimeError("Render worker failed: " + header["message"])
+        except Exception:
+            self.stop_render_workers()
+            raise
 
     def process(self):
         """
@@ -702,6 +1144,14 @@ class DeepArcTimelineTest(ScriptedLoadableModuleTest):
         """
         self.setUp()
         self.test_dummy()
+        self.setUp()
+        self.test_render_worker()
+        self.setUp()
+        self.test_statistics_index()
+        self.setUp()
+        self.test_timeline_geometry()
+        self.setUp()
+        self.test_vector_volume_lattice()
 
     def setUp(self):
         """
@@ -723,7 +1173,300 @@ class DeepArcTimelineTest(ScriptedLoadableModuleTest):
         """
         self.delayDisplay("Dummy test passed.")
 
+    def test_render_worker(self):
+        """
+        Render a tile of a synthetic volume in a local render worker.
+        """
+        import numpy as np
+
+        from DeepArcTimelineLib import render_worker
+        from DeepArcTimelineLib.slice_geometry import TimelineGeometry
+
+        logic = DeepArcTimelineLogic()
+        logic.set_local_render_worker_count(1)
+        try:
+            volume = np.arange(4 * 8 * 8, dtype=np.int16).reshape(4, 8, 8)
+            logic.render_cache_dir = tempfile.mkdtemp(prefix="DeepArcTimeline-")
+            volume_path = os.path.join(logic.render_cache_dir, "volume.npy")
+            np.save(volume_path, volume)
+
+            # Axial rows map slice view pixels to the voxels of slice k=row.
+            geometry = TimelineGeometry.for_volume(
+                np.eye(4), np.eye(4), [8, 8, 1], np.eye(4), volume.shape
+            )
+            job = render_worker.make_render_job(
+                0,
+                volume_path,
+                "test",
+                geometry.xy_to_ijk_rows(),
+                geometry.dimensions,
+                volume.max(),
+                volume.max() / 2,
+                [{"row": 2, "col": 0}],
+                8,
+            )
+
+            tiles = []
+            logic.render_tiles([job], lambda r, c, data: tiles.append((r, c, data)))
+
+            self.assertEqual(len(tiles), 1)
+            row, col, data = tiles[0]
+            self.assertEqual((row, col), (2, 0))
+            image = qt.QImage()
+            self.assertTrue(image.loadFromData(qt.QByteArray(data)))
+            self.assertEqual((image.width(), image.height()), (8, 8))
+        finally:
+            logic.stop_render_workers()
+
+        self.delayDisplay("Render worker test passed.")
+
+    def test_statistics_index(self):
+        """
+        Find the tile with the largest intensity change between sequence items.
+        """
+        import numpy as np
+
+        from DeepArcTimelineLib.intensity_index import IntensityStatisticsIndex
+
+        index = IntensityStatisticsIndex(3, 4)
+        for col in range(4):
+            samples = np.zeros((3, 4, 4))
+            if col >= 2:
+                # Contrast arrives in row 1 at column 2
+                samples[1] = 100.0
+            samples[2] = np.nan
+            index.add_column(col, samples)
+        index.finalize()
+
+        self.assertEqual(index.max_change(), (1, 2))
+        self.assertEqual(index.max_change_col(1), 2)
+        self.assertEqual(index.mean[1, 3], 100.0)
+        self.assertTrue(np.isnan(index.mean[2, 0]))
+        self.assertEqual(index.normalized_change(1), [0.0, 0.0, 1.0, 0.0])
+
+        self.delayDisplay("Statistics index test passed.")
+
+    def test_timeline_geometry(self):
+        """
+        Derive the rows of a sagittal timeline from the slice normal.
+        """
+        import numpy as np
+
+        from DeepArcTimelineLib.slice_geometry import TimelineGeometry
+
+        volume = np.arange(4 * 6 * 8, dtype=np.int16).reshape(4, 6, 8)
+        ijk_to_ras = np.diag([1.0, 1.0, 2.5, 1.0])
+        ijk_to_ras[:3, 3] = [10.0, 20.0, 30.0]
+
+        # Sagittal slice: X points anterior, Y superior and the normal right.
+        slice_to_ras = np.array(
+            [[0, 0, 1, 13], [1, 0, 0, 0], [0, 1, 0, 0], [0, 0, 0, 1]], dtype=float
+        )
+        xy_to_ras = slice_to_ras.copy()
+        xy_to_ras[:3, 3] = [13.0, 20.0, 30.0]
+        xy_to_ras[2, 1] = 2.5
+
+        geometry = TimelineGeometry.for_volume(
+            slice_to_ras, xy_to_ras, [6, 4, 1], np.linalg.inv(ijk_to_ras), volume.shape
+        )
+
+        self.assertEqual(geometry.rows, 8)
+        self.assertAlmostEqual(geometry.spacing, 1.0)
+        self.assertAlmostEqual(geometry.slice_offset_for_row(3), 13.0)
+        self.assertEqual(geometry.row_for_slice_offset(13.0), 3)
+
+        self.assertTrue(
+            geometry.shares_lattice(np.linalg.inv(ijk_to_ras), volume.shape)
+        )
+        self.assertFalse(geometry.shares_lattice(np.eye(4), volume.shape))
+        self.assertFalse(geometry.shares_lattice(np.linalg.inv(ijk_to_ras), (5, 6, 8)))
+
+        samples = geometry.sample(volume, 6)
+        self.assertEqual(samples.shape, (8, 4, 6))
+        np.testing.assert_array_equal(samples[3], volume[::-1, :, 3])
+
+        self.delayDisplay("Timeline geometry test passed.")
+
+    def test_vector_volume_lattice(self):
+        """
+        Vector volumes must not be sampled with the index maps of scalar volumes.
+        """
+        import numpy as np
+
+        from DeepArcTimelineLib.slice_geometry import TimelineGeometry
+
+        scalars = np.zeros((4, 6, 8), dtype=np.int16)
+        vectors = np.zeros((4, 6, 8, 3), dtype=np.uint8)
+        scalar_node = slicer.util.addVolumeFromArray(scalars)
+        vector_node = slicer.util.addVolumeFromArray(
+            vectors, nodeClassName="vtkMRMLVectorVolumeNode"
+        )
+
+        geometry = TimelineGeometry.for_volume(
+            np.eye(4),
+            np.eye(4),
+            [8, 6, 1],
+            ras_to_ijk_array(scalar_node),
+            scalars.shape,
+        )
+
+        self.assertEqual(
+            shared_lattice_data_nodes(geometry, scalar_node, None, 1), [scalar_node]
+        )
+        self.assertIsNone(shared_lattice_data_nodes(geometry, vector_node, None, 1))
+
+        self.assertFalse(
+            geometry.shares_lattice(ras_to_ijk_array(vector_node), vectors.shape)
+        )
+        with self.assertRaises(ValueError):
+            geometry.sample(vectors, 8)
+
+        self.delayDisplay("Vector volume lattice test passed.")
+
+
+def background_volume_node(slice_logic: "vtkMRMLSliceLogic"):
+    volume_node = slicer.mrmlScene.GetNodeByID(
+        slice_logic.GetSliceCompositeNode().GetBackgroundVolumeID()
+    )
+    if volume_node is None or volume_node.GetImageData() is None:
+        return None
+    return volume_node
+
+
+def ras_to_ijk_array(volume_node) -> "np.ndarray":
+    ras_to_ijk = vtkMatrix4x4()
+    volume_node.GetRASToIJKMatrix(ras_to_ijk)
+    return slicer.util.arrayFromVTKMatrix(ras_to_ijk)
+
+
+def create_timeline_geometry(slice_logic: "vtkMRMLSliceLogic") -> "TimelineGeometry":
+    """
+    Derive the timeline rows from the slice normal and the voxel lattice of the
+    background volume. All items of a sequence are assumed to share that lattice.
+    """
+    from DeepArcTimelineLib.slice_geometry import TimelineGeometry
+
+    slice_node = slice_logic.GetSliceNode()
+    slice_to_ras = slicer.util.arrayFromVTKMatrix(slice_node.GetSliceToRAS())
+    xy_to_ras = slicer.util.arrayFromVTKMatrix(slice_node.GetXYToRAS())
+    dimensions = slice_node.GetDimensions()
+
+    volume_node = background_volume_node(slice_logic)
+    if volume_node is not None:
+        return TimelineGeometry.for_volume(
+            slice_to_ras,
+            xy_to_ras,
+            dimensions,
+            ras_to_ijk_array(volume_node),
+            tuple(reversed(volume_node.GetImageData().GetDimensions())),
+        )
+
+    # Without a background volume, fall back to the slice bounds of all layers.
+    bounds = [0.0] * 6
+    slice_logic.GetSliceBounds(bounds)
+    spacing = slice_logic.GetLowestVolumeSliceSpacing()[2]
+    rows = int((bounds[5] - bounds[4]) / spacing)
+    return TimelineGeometry(
+        slice_to_ras, xy_to_ras, dimensions, bounds[4], spacing, rows
+    )
+
+
+def volume_node_for_item(
+    volume_node,
+    sequence_browser_node: Optional["vtkMRMLSequenceBrowserNode"],
+    item_number: int,
+):
+    """
+    Return the data node that the proxy ``volume_node`` shows at ``item_number``
+    without changing the selected item of the sequence browser.
+    """
+    if sequence_browser_node is None:
+        return volume_node
+    sequence_node = sequence_browser_node.GetSequenceNode(volume_node)
+    if sequence_node is None:
+        return volume_node
+    index_value = sequence_browser_node.GetMasterSequenceNode().GetNthIndexValue(
+        item_number
+    )
+    data_node = sequence_node.GetDataNodeAtValue(index_value)
+    return data_node if data_node is not None else volume_node
+
+
+def shared_lattice_data_nodes(
+    geometry: "TimelineGeometry",
+    volume_node,
+    sequence_browser_node: Optional["vtkMRMLSequenceBrowserNode"],
+    cols: int,
+) -> Optional[List]:
+    """
+    Return the data node of every sequence item, or None if any of them does not share
+    the voxel lattice of ``geometry`` (and its index maps would sample wrong voxels).
+    Vector and RGB volumes are not supported, as their components are interleaved.
+    """
+    data_nodes = []
+    for col in range(cols):
+        data_node = volume_node_for_item(volume_node, sequence_browser_node, col)
+        image_data = data_node.GetImageData()
+        if image_data is None or image_data.GetNumberOfScalarComponents() != 1:
+            return None
+        if not geometry.shares_lattice(
+            ras_to_ijk_array(data_node), tuple(reversed(image_data.GetDimensions()))
+        ):
+            return None
+        data_nodes.append(data_node)
+    return data_nodes
+
 
 def clear_layout(layout: qt.QLayout):
     for i in reversed(range(layout.count())):
         layout.itemAt(i).widget().setParent(None)
+
+
+def on_startup_completed():
+    _startup_timings["startup_completed"] = time.perf_counter()
+
+
+def startup_timing_report() -> str:
+    """
+    Summarize how much of the Slicer launch and of the first opening of this module is
+    spent in this extension.
+    """
+
+    def ms(seconds: float) -> str:
+        return "%.1f ms" % (1000 * seconds)
+
+    def share(part: float, total: float) -> str:
+        return "%.1f %%" % (100 * part / total) if total > 0 else "n/a"
+
+    t = _startup_timings
+    launch_cost = t.get("import", 0.0) + t.get("module_init", 0.0)
+    lines = [
+        "DeepArc Timeline start-up timing:",
+        "  Module import: " + ms(t.get("import", 0.0)),
+        "  Module registration: " + ms(t.get("module_init", 0.0)),
+    ]
+
+    from DeepArcTimelineLib.process_info import process_start_time
+
+    start = process_start_time()
+    if "startup_completed" in t and start is not None:
+        launch = t["startup_completed"] - start
+        lines.append(
+            "  Slicer launch: %s, of which %s (%s) in this extension"
+            % (ms(launch), ms(launch_cost), share(launch_cost, launch))
+        )
+    elif start is None:
+        lines.append("  Slicer launch: unknown (process start time not available)")
+    else:
+        lines.append("  Slicer launch: unknown (module loaded after start-up)")
+
+    if "first_open" in t:
+        setup = t.get("widget_setup", 0.0)
+        lines.append(
+            "  First module open: %s, of which %s (%s) in this extension's setup"
+            % (ms(t["first_open"]), ms(setup), share(setup, t["first_open"]))
+        )
+    return "\n".join(lines)
+
+
+_startup_timings["import"] = time.perf_counter() - _MODULE_IMPORT_START
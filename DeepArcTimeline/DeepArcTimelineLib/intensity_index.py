@@ -0,0 +1,93 @@
+"""
+Per-tile intensity statistics of the DeepArc Timeline.
+
+Like ``render_worker``, this module only depends on NumPy.
+"""
+
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+
+class IntensityStatisticsIndex:
+    """
+    Statistics for every (row, col) tile of a timeline, computed from the raw voxel
+    intensities sampled on the slice planes:
+
+    - ``mean``: mean intensity, shape (rows, cols)
+    - ``percentiles``: intensity percentiles (see ``PERCENTILES``), shape
+      (rows, cols, len(PERCENTILES))
+    - ``change``: mean absolute intensity difference to the tile in the previous
+      column, shape (rows, cols); 0 in the first column
+
+    Samples outside of the volume are ignored. Tiles without any samples have NaN
+    statistics. The columns have to be added in order, after which ``finalize``
+    precomputes the answers of the navigation queries.
+    """
+
+    PERCENTILES = (5, 50, 95)
+
+    def __init__(self, rows: int, cols: int):
+        self.rows = rows
+        self.cols = cols
+
+        self.mean = np.full((rows, cols), np.nan)
+        self.percentiles = np.full((rows, cols, len(self.PERCENTILES)), np.nan)
+        self.change = np.zeros((rows, cols))
+
+        self._previous_samples: Optional[np.ndarray] = None
+        self._max_change = (0, 0)
+        self._max_change_col_per_row = np.zeros(rows, dtype=np.int64)
+        self._max_change_row_per_col = np.zeros(cols, dtype=np.int64)
+
+    def add_column(self, col: int, samples: np.ndarray):
+        """
+        Add the samples of all rows of column ``col`` as an array of shape
+        (rows, height, width) that is NaN outside of the volume.
+        """
+        flat = samples.reshape(self.rows, -1)
+        valid = np.any(~np.isnan(flat), axis=1)
+        if np.any(valid):
+            self.mean[valid, col] = np.nanmean(flat[valid], axis=1)
+            self.percentiles[valid, col] = np.nanpercentile(
+                flat[valid], self.PERCENTILES, axis=1
+            ).T
+
+        if self._previous_samples is not None:
+            difference = np.abs(flat - self._previous_samples)
+            valid = np.any(~np.isnan(difference), axis=1)
+            if np.any(valid):
+                self.change[valid, col] = np.nanmean(difference[valid], axis=1)
+        self._previous_samples = flat
+
+    def finalize(self):
+        self._previous_samples = None
+        if self.rows == 0 or self.cols == 0:
+            return
+        self._max_change = np.unravel_index(np.argmax(self.change), self.change.shape)
+        self._max_change_col_per_row = np.argmax(self.change, axis=1)
+        self._max_change_row_per_col = np.argmax(self.change, axis=0)
+
+    # Queries
+
+    def max_change(self) -> Tuple[int, int]:
+        """
+        Return (row, col) of the tile that differs most from its previous column.
+        """
+        return int(self._max_change[0]), int(self._max_change[1])
+
+    def max_change_col(self, row: int) -> int:
+        return int(self._max_change_col_per_row[row])
+
+    def max_change_row(self, col: int) -> int:
+        return int(self._max_change_row_per_col[col])
+
+    def normalized_change(self, row: int) -> List[float]:
+        """
+        Return the change of every column of ``row``, scaled to [0, 1].
+        """
+        values = self.change[row]
+        low, high = values.min(), values.max()
+        if high <= low:
+            return [0.0] * self.cols
+        return ((values - low) / (high - low)).tolist()
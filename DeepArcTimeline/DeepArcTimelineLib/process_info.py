@@ -0,0 +1,78 @@
+"""
+Creation time of the current process, used for the start-up timing report of the
+DeepArc Timeline. This module only depends on the standard library.
+"""
+
+import os
+import sys
+import time
+from typing import Optional
+
+
+def process_start_time() -> Optional[float]:
+    """
+    Return when the Slicer process started on the time.perf_counter() clock, or None
+    if the operating system does not tell.
+    """
+    created = process_creation_time()
+    if created is None:
+        return None
+    return time.perf_counter() - (time.time() - created)
+
+
+def process_creation_time() -> Optional[float]:
+    """
+    Return the creation time of this process as a Unix timestamp. psutil is used if it
+    is installed, otherwise the time is read from the operating system directly.
+    """
+    try:
+        import psutil
+
+        return psutil.Process().create_time()
+    except ImportError:
+        pass
+
+    try:
+        if sys.platform.startswith("linux"):
+            # Field 22 of /proc/self/stat is the start time in clock ticks after boot.
+            # The command name in field 2 may contain spaces, so split after it.
+            with open("/proc/self/stat") as f:
+                fields = f.read().rsplit(")", 1)[1].split()
+            with open("/proc/stat") as f:
+                boot_time = next(
+                    int(line.split()[1]) for line in f if line.startswith("btime")
+                )
+            return boot_time + int(fields[19]) / os.sysconf("SC_CLK_TCK")
+
+        if sys.platform == "win32":
+            import ctypes
+            from ctypes import wintypes
+
+            creation, exit_, kernel, user = (wintypes.FILETIME() for _ in range(4))
+            kernel32 = ctypes.windll.kernel32
+            if not kernel32.GetProcessTimes(
+                kernel32.GetCurrentProcess(),
+                ctypes.byref(creation),
+                ctypes.byref(exit_),
+                ctypes.byref(kernel),
+                ctypes.byref(user),
+            ):
+                return None
+            # FILETIME counts 100 ns intervals since 1601-01-01.
+            ticks = (creation.dwHighDateTime << 32) | creation.dwLowDateTime
+            return ticks / 1e7 - 11644473600
+
+        # Other POSIX systems (macOS): elapsed time as [[dd-]hh:]mm:ss
+        import subprocess
+
+        elapsed = subprocess.check_output(
+            ["ps", "-o", "etime=", "-p", str(os.getpid())], universal_newlines=True
+        ).strip()
+        days, _, clock = elapsed.rpartition("-")
+        seconds = 0
+        for part in clock.split(":"):
+            seconds = 60 * seconds + int(part)
+        seconds += 86400 * int(days or 0)
+        return time.time() - seconds
+    except (OSError, ValueError, IndexError, StopIteration, AttributeError):
+        return None
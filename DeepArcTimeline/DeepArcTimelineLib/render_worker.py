@@ -0,0 +1,389 @@
+"""
+Out-of-process tile rendering for the DeepArc Timeline.
+
+This module must stay importable without 3D Slicer, because it is executed by
+``PythonSlicer`` (or any Python interpreter with NumPy) in a separate worker process:
+
+    PythonSlicer render_worker.py --host 0.0.0.0 --port 0
+
+The worker prints the address it listens on as its first line of output. The authkey
+that clients must present is read from the ``DEEPARC_WORKER_AUTHKEY`` environment
+variable (hex encoded).
+
+Every message is a UTF-8 encoded JSON header, optionally followed by a binary payload
+whose size is given in the header's ``payload_size`` field. A client sends ``render``
+jobs; the worker answers with one ``tile`` message per requested tile and finishes the
+job with a ``done`` message (or an ``error`` message if the job failed).
+"""
+
+import argparse
+import binascii
+import json
+import os
+import queue
+import struct
+import subprocess
+import sys
+import threading
+import traceback
+import zlib
+from multiprocessing.connection import Client, Connection, Listener
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+PROTOCOL_VERSION = 1
+
+AUTHKEY_ENVIRONMENT_VARIABLE = "DEEPARC_WORKER_AUTHKEY"
+
+# Seconds to wait for a local worker to report its address
+LAUNCH_TIMEOUT = 30.0
+
+MESSAGE_RENDER = "render"
+MESSAGE_SHUTDOWN = "shutdown"
+MESSAGE_TILE = "tile"
+MESSAGE_DONE = "done"
+MESSAGE_ERROR = "error"
+
+TILE_FORMAT_PNG = "png"
+
+
+# Protocol
+
+
+def send_message(conn: Connection, header: dict, payload: bytes = b""):
+    header = dict(header, version=PROTOCOL_VERSION, payload_size=len(payload))
+    conn.send_bytes(json.dumps(header).encode("utf-8"))
+    if payload:
+        conn.send_bytes(payload)
+
+
+def receive_message(conn: Connection) -> Tuple[dict, bytes]:
+    header = json.loads(conn.recv_bytes().decode("utf-8"))
+    if header.get("version") != PROTOCOL_VERSION:
+        raise RuntimeError(
+            "Unsupported render worker protocol version: %s" % header.get("version")
+        )
+    payload = b""
+    if header.get("payload_size"):
+        payload = conn.recv_bytes()
+    return header, payload
+
+
+def make_render_job(
+    job_id: int,
+    volume_path: str,
+    geometry_id: str,
+    xy_to_ijk_rows: Sequence[Sequence[float]],
+    dimensions: Sequence[int],
+    window: float,
+    level: float,
+    tiles: List[dict],
+    tile_size: int,
+) -> dict:
+    """
+    Describe a batch of tiles that are sampled from the same volume.
+
+    ``volume_path`` points to a ``.npy`` file holding the voxel array in KJI order (as
+    returned by ``slicer.util.arrayFromVolume``). ``xy_to_ijk_rows`` holds one
+    row-major 4x4 matrix per timeline row that maps slice view pixels to voxel
+    indices, and ``dimensions`` are the slice view dimensions in pixels. Workers cache
+    the reslice index maps of a geometry by ``geometry_id``, so jobs that share it
+    must also share the matrices and the voxel lattice. Each tile is a dict with its
+    ``row`` and ``col``.
+    """
+    return {
+        "type": MESSAGE_RENDER,
+        "job_id": job_id,
+        "volume": {"path": volume_path},
+        "geometry": {
+            "id": geometry_id,
+            "xy_to_ijk": np.asarray(xy_to_ijk_rows, dtype=np.float64)
+            .reshape(-1, 16)
+            .tolist(),
+        },
+        "dimensions": [int(d) for d in dimensions[:2]],
+        "window": float(window),
+        "level": float(level),
+        "tile_size": int(tile_size),
+        "tiles": tiles,
+    }
+
+
+# Rendering
+
+
+def tile_shape(dimensions: Sequence[int], tile_size: int) -> Tuple[int, int]:
+    """
+    Return (height, width) of a tile that fits into a square of ``tile_size`` while
+    keeping the aspect ratio of the slice view.
+    """
+    width, height = dimensions[0], dimensions[1]
+    scale = tile_size / max(width, height)
+    return max(1, int(round(height * scale))), max(1, int(round(width * scale)))
+
+
+def reslice_index_map(
+    xy_to_ijk_rows: Sequence[Sequence[float]],
+    volume_shape: Sequence[int],
+    dimensions: Sequence[int],
+    tile_size: int,
+) -> np.ndarray:
+    """
+    Compute, for every pixel of every row's tile, the flat index of the nearest voxel
+    in a volume of ``volume_shape`` (KJI order), or -1 if the pixel lies outside of the
+    volume. The result has shape (rows, height, width), and the first row of each tile
+    is the top row of the slice view.
+
+    The map only depends on the voxel lattice, so it can be reused for every sequence
+    item that shares it (see ``gather``).
+    """
+    out_height, out_width = tile_shape(dimensions, tile_size)
+    width, height = dimensions[0], dimensions[1]
+
+    # Slice view pixel centers lie on integer XY coordinates, with y pointing up.
+    x = (np.arange(out_width) + 0.5) * (width / out_width) - 0.5
+    y = height - 0.5 - (np.arange(out_height) + 0.5) * (height / out_height)
+    xx, yy = np.meshgrid(x, y)
+
+    m = np.asarray(xy_to_ijk_rows, dtype=np.float64).reshape(-1, 4, 4)
+    m = m[:, :, :, np.newaxis, np.newaxis]
+    i = np.rint(m[:, 0, 0] * xx + m[:, 0, 1] * yy + m[:, 0, 3]).astype(np.int64)
+    j = np.rint(m[:, 1, 0] * xx + m[:, 1, 1] * yy + m[:, 1, 3]).astype(np.int64)
+    k = np.rint(m[:, 2, 0] * xx + m[:, 2, 1] * yy + m[:, 2, 3]).astype(np.int64)
+
+    inside = (
+        (i >= 0)
+        & (i < volume_shape[2])
+        & (j >= 0)
+        & (j < volume_shape[1])
+        & (k >= 0)
+        & (k < volume_shape[0])
+    )
+    index_map = np.where(inside, (k * volume_shape[1] + j) * volume_shape[2] + i, -1)
+    # The maps of all rows are kept in memory, so do not use more bits than needed.
+    if np.prod(volume_shape[:3]) < np.iinfo(np.int32).max:
+        index_map = index_map.astype(np.int32)
+    return index_map
+
+
+def gather(
+    volume: np.ndarray, index_map: np.ndarray, background: float = 0.0
+) -> np.ndarray:
+    """
+    Sample ``volume`` at the voxels of a reslice index map.
+    """
+    inside = index_map >= 0
+    result = np.full(index_map.shape, background, dtype=np.float64)
+    result[inside] = volume.reshape(-1)[index_map[inside]]
+    return result
+
+
+def apply_window_level(image: np.ndarray, window: float, level: float) -> np.ndarray:
+    window = max(float(window), 1e-6)
+    lower = level - window / 2.0
+    scaled = (image.astype(np.float64) - lower) * (255.0 / window)
+    return np.clip(scaled, 0, 255).astype(np.uint8)
+
+
+def encode_png(image: np.ndarray) -> bytes:
+    """
+    Encode a 2D uint8 array as a grayscale PNG.
+    """
+
+    def chunk(tag: bytes, data: bytes) -> bytes:
+        crc = binascii.crc32(tag + data) & 0xFFFFFFFF
+        return struct.pack(">I", len(data)) + tag + data + struct.pack(">I", crc)
+
+    height, width = image.shape
+    rows = np.zeros((height, width + 1), dtype=np.uint8)
+    rows[:, 1:] = image
+    return b"".join(
+        [
+            b"\x89PNG\r\n\x1a\n",
+            chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 0, 0, 0, 0)),
+            chunk(b"IDAT", zlib.compress(rows.tobytes(), 6)),
+            chunk(b"IEND", b""),
+        ]
+    )
+
+
+class RenderWorker:
+    """
+    Executes render jobs on a single connection.
+    """
+
+    def __init__(self, conn: Connection):
+        self.conn = conn
+        self._index_maps: Dict[tuple, np.ndarray] = {}
+        self._geometry_id: Optional[str] = None
+
+    def serve(self):
+        while True:
+            try:
+                header, _ = receive_message(self.conn)
+            except EOFError:
+                return
+            if header["type"] == MESSAGE_SHUTDOWN:
+                return
+            if header["type"] == MESSAGE_RENDER:
+                self.render(header)
+
+    def render(self, job: dict):
+        job_id = job["job_id"]
+        error = None
+        try:
+            self.render_tiles(job)
+        except Exception as e:
+            traceback.print_exc()
+            error = str(e)
+        # Only reply once the volume is unmapped, so that the client may delete the
+        # file as soon as the job is done (Windows refuses to delete mapped files).
+        if error is None:
+            send_message(self.conn, {"type": MESSAGE_DONE, "job_id": job_id})
+        else:
+            send_message(
+                self.conn,
+                {"type": MESSAGE_ERROR, "job_id": job_id, "message": error},
+            )
+
+    def render_tiles(self, job: dict):
+        if job["geometry"]["id"] != self._geometry_id:
+            # A new geometry means a new timeline, so no cached index map is needed.
+            self._index_maps = {}
+            self._geometry_id = job["geometry"]["id"]
+
+        volume = np.load(job["volume"]["path"], mmap_mode="r")
+        index_map = self.load_index_map(job, volume.shape)
+        tiles = job["tiles"]
+        images = gather(volume, index_map[[tile["row"] for tile in tiles]])
+        del volume
+        images = apply_window_level(images, job["window"], job["level"])
+        for tile, image in zip(tiles, images):
+            send_message(
+                self.conn,
+                {
+                    "type": MESSAGE_TILE,
+                    "job_id": job["job_id"],
+                    "row": tile["row"],
+                    "col": tile["col"],
+                    "format": TILE_FORMAT_PNG,
+                },
+                encode_png(image),
+            )
+
+    def load_index_map(self, job: dict, volume_shape: Tuple[int, ...]) -> np.ndarray:
+        key = (job["tile_size"], tuple(volume_shape))
+        if key not in self._index_maps:
+            self._index_maps[key] = reslice_index_map(
+                job["geometry"]["xy_to_ijk"],
+                volume_shape,
+                job["dimensions"],
+                job["tile_size"],
+            )
+        return self._index_maps[key]
+
+
+# Client side
+
+
+class RenderWorkerClient:
+    """
+    Connection to a render worker, optionally owning the local worker process.
+    """
+
+    def __init__(
+        self,
+        conn: Connection,
+        process: Optional[subprocess.Popen] = None,
+    ):
+        self.conn = conn
+        self.process = process
+
+    @classmethod
+    def connect(cls, address: Tuple[str, int], authkey: bytes) -> "RenderWorkerClient":
+        return cls(Client(tuple(address), authkey=authkey))
+
+    @classmethod
+    def launch_local(
+        cls, python_executable: str, authkey: bytes, timeout: float = LAUNCH_TIMEOUT
+    ) -> "RenderWorkerClient":
+        """
+        Start a worker process on this machine and connect to it. Raises RuntimeError
+        if the worker does not report its address within ``timeout`` seconds.
+        """
+        env = dict(os.environ)
+        env[AUTHKEY_ENVIRONMENT_VARIABLE] = authkey.hex()
+        process = subprocess.Popen(
+            [python_executable, os.path.abspath(__file__), "--port", "0"],
+            stdout=subprocess.PIPE,
+            env=env,
+            universal_newlines=True,
+        )
+
+        # Reading the pipe blocks, and select() does not support pipes on Windows, so
+        # read the address in a thread to be able to give up on a hanging worker.
+        lines = queue.Queue()
+        threading.Thread(
+            target=lambda: lines.put(process.stdout.readline()), daemon=True
+        ).start()
+        try:
+            line = lines.get(timeout=timeout).strip()
+        except queue.Empty:
+            line = ""
+        if not line:
+            process.kill()
+            process.wait()
+            process.stdout.close()
+            raise RuntimeError("Render worker did not report its address")
+        host, port = line.rsplit(":", 1)
+        return cls(Client((host, int(port)), authkey=authkey), process)
+
+    def send_job(self, job: dict):
+        send_message(self.conn, job)
+
+    def receive(self) -> Tuple[dict, bytes]:
+        return receive_message(self.conn)
+
+    def close(self):
+        try:
+            send_message(self.conn, {"type": MESSAGE_SHUTDOWN})
+        except (OSError, ValueError):
+            pass
+        self.conn.close()
+        if self.process is not None:
+            try:
+                self.process.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+            self.process.stdout.close()
+            self.process = None
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="DeepArc Timeline render worker")
+    parser.add_argument("--host", default="localhost")
+    parser.add_argument("--port", type=int, default=0)
+    parser.add_argument(
+        "--persistent",
+        action="store_true",
+        help="Keep accepting clients instead of exiting after the first disconnects.",
+    )
+    args = parser.parse_args(argv)
+
+    authkey = bytes.fromhex(os.environ.get(AUTHKEY_ENVIRONMENT_VARIABLE, ""))
+    if not authkey:
+        parser.error("%s must be set" % AUTHKEY_ENVIRONMENT_VARIABLE)
+
+    with Listener((args.host, args.port), authkey=authkey) as listener:
+        host, port = listener.address
+        print("%s:%d" % (host, port), flush=True)
+        while True:
+            with listener.accept() as conn:
+                RenderWorker(conn).serve()
+            if not args.persistent:
+                return
+
+
+if __name__ == "__main__":
+    sys.exit(main())
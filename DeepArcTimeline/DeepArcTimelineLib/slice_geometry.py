@@ -0,0 +1,143 @@
+"""
+Geometry of the slice planes that make up the rows of the DeepArc Timeline.
+
+Like ``render_worker``, this module only depends on NumPy.
+"""
+
+from typing import Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+from DeepArcTimelineLib.render_worker import gather, reslice_index_map
+
+
+class TimelineGeometry:
+    """
+    Maps timeline rows to slice planes that are parallel to the slice view and spaced
+    along its normal, for any slice orientation.
+
+    The slice offset of a row is the position of its plane along the slice normal, as
+    returned by ``vtkMRMLSliceLogic.GetSliceOffset``. Moving the slice to another
+    offset translates it along the normal, so the XY to RAS matrix of every row can be
+    derived from the current one without touching the slice node.
+    """
+
+    def __init__(
+        self,
+        slice_to_ras: np.ndarray,
+        xy_to_ras: np.ndarray,
+        dimensions: Sequence[int],
+        min_offset: float,
+        spacing: float,
+        rows: int,
+    ):
+        self.xy_to_ras = np.asarray(xy_to_ras, dtype=np.float64)
+        self.dimensions = [int(d) for d in dimensions[:2]]
+        self.min_offset = min_offset
+        self.spacing = spacing
+        self.rows = max(rows, 0)
+
+        slice_to_ras = np.asarray(slice_to_ras, dtype=np.float64)
+        self.normal = slice_to_ras[:3, 2] / np.linalg.norm(slice_to_ras[:3, 2])
+        self.current_offset = float(self.normal @ slice_to_ras[:3, 3])
+
+        # Only known if the geometry was derived from a volume
+        self.ras_to_ijk: Optional[np.ndarray] = None
+        self.volume_shape: Optional[Tuple[int, ...]] = None
+
+        self._index_maps: Dict[int, np.ndarray] = {}
+
+    @classmethod
+    def for_volume(
+        cls,
+        slice_to_ras: np.ndarray,
+        xy_to_ras: np.ndarray,
+        dimensions: Sequence[int],
+        ras_to_ijk: np.ndarray,
+        volume_shape: Sequence[int],
+    ) -> "TimelineGeometry":
+        """
+        Create one row per voxel step along the slice normal, covering the voxel
+        centers of a volume of ``volume_shape`` (KJI order).
+        """
+        slice_to_ras = np.asarray(slice_to_ras, dtype=np.float64)
+        ras_to_ijk = np.asarray(ras_to_ijk, dtype=np.float64)
+        normal = slice_to_ras[:3, 2] / np.linalg.norm(slice_to_ras[:3, 2])
+
+        # The distance along the normal after which the slice has moved by at most one
+        # voxel along each volume axis. For axial slices of an axial volume, this is the
+        # slice thickness.
+        spacing = 1.0 / np.abs(ras_to_ijk[:3, :3] @ normal).max()
+
+        k, j, i = (max(n - 1, 0) for n in volume_shape[:3])
+        corners = np.array(
+            [[ci, cj, ck, 1.0] for ci in (0, i) for cj in (0, j) for ck in (0, k)]
+        )
+        offsets = (np.linalg.inv(ras_to_ijk) @ corners.T)[:3].T @ normal
+        min_offset, max_offset = float(offsets.min()), float(offsets.max())
+        rows = int(np.floor((max_offset - min_offset) / spacing + 1e-6)) + 1
+
+        geometry = cls(slice_to_ras, xy_to_ras, dimensions, min_offset, spacing, rows)
+        geometry.ras_to_ijk = ras_to_ijk
+        geometry.volume_shape = tuple(int(n) for n in volume_shape[:3])
+        return geometry
+
+    def slice_offset_for_row(self, row: int) -> float:
+        return self.min_offset + self.spacing * row
+
+    def row_for_slice_offset(self, slice_offset: float) -> int:
+        return int(round((slice_offset - self.min_offset) / self.spacing))
+
+    def xy_to_ras_rows(self) -> np.ndarray:
+        """
+        Return the XY to RAS matrix of every row, shape (rows, 4, 4).
+        """
+        shifts = self.slice_offset_for_row(np.arange(self.rows)) - self.current_offset
+        result = np.repeat(self.xy_to_ras[np.newaxis], self.rows, axis=0)
+        result[:, :3, 3] += shifts[:, np.newaxis] * self.normal
+        return result
+
+    def xy_to_ijk_rows(self) -> np.ndarray:
+        """
+        Return the XY to IJK matrix of every row, shape (rows, 4, 4).
+        """
+        return self.ras_to_ijk @ self.xy_to_ras_rows()
+
+    def index_map(self, tile_size: int) -> np.ndarray:
+        """
+        Return the reslice index map of all rows (see ``reslice_index_map``). It is
+        computed once per tile size and shared by all sequence items.
+        """
+        if tile_size not in self._index_maps:
+            self._index_maps[tile_size] = reslice_index_map(
+                self.xy_to_ijk_rows(), self.volume_shape, self.dimensions, tile_size
+            )
+        return self._index_maps[tile_size]
+
+    def shares_lattice(
+        self, ras_to_ijk: np.ndarray, volume_shape: Sequence[int]
+    ) -> bool:
+        """
+        Check whether a volume has the voxel lattice this geometry was created for, so
+        that its index maps can be reused for it. Volumes with more than one component
+        per voxel never do.
+        """
+        if self.ras_to_ijk is None:
+            return False
+        return tuple(int(n) for n in volume_shape) == self.volume_shape and bool(
+            np.allclose(ras_to_ijk, self.ras_to_ijk, atol=1e-6)
+        )
+
+    def sample(
+        self, volume: np.ndarray, tile_size: int, background: float = np.nan
+    ) -> np.ndarray:
+        """
+        Sample ``volume`` at every row, returning shape (rows, height, width). The
+        volume must share the voxel lattice this geometry was created for.
+        """
+        if tuple(volume.shape) != self.volume_shape:
+            raise ValueError(
+                "Volume shape %s does not match the timeline geometry %s"
+                % (volume.shape, self.volume_shape)
+            )
+        return gather(volume, self.index_map(tile_size), background)